@@ -1,99 +1,171 @@
 from argparse import ArgumentParser
-from ast import FunctionDef, parse, unparse, get_docstring, walk as ast_walk, Return
-from os import walk
-from os.path import isdir, join
-from pathlib import Path
-from re import search, match, DOTALL
+from ast import AST, AsyncFunctionDef, expr, FunctionDef, get_docstring, iter_child_nodes, Name, parse, Return, unparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from functools import lru_cache, partial
+from hashlib import blake2b
+from io import BytesIO
+from os import getpid, makedirs, remove, replace, scandir, sep
+from os.path import abspath, dirname, isdir, join, normcase, realpath
+from pickle import dump, load, UnpicklingError
+from re import compile as re_compile
 from rich.console import Console, Group
 from rich.markdown import Markdown
 from rich.panel import Panel
+from rich.text import Text
 from rich.theme import Theme
+from sys import version_info
+from tokenize import detect_encoding
+from typing import Optional
 
 
-def get_function_args_with_defaults(function: FunctionDef) -> dict:
+__version__ = "1.2.1"
+# Cached results are only valid for the same Python version and checker code, so a changed checker never reuses them
+with open(__file__, "rb") as _checker_file:
+    CACHE_KEY = f"py{version_info.major}{version_info.minor}-{__version__}-{blake2b(_checker_file.read(), digest_size=8).hexdigest()}"
+
+_ARG_LINE_RE = re_compile(r"(\w+)(?:\s*\(([^)]+)\))?\s*:")
+
+# Dotted names, subscripts, ", " separators and " | " unions, which ast.unparse writes exactly like this
+_SIMPLE_SOURCE_RE = re_compile(r"(?:[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*|\.\.\.|\[|\]|, (?=[\w\[.])| \| )+")
+
+_IGNORED_DIRECTORIES = {"venv", ".venv", "test", "tests", ".git", "__pycache__", "node_modules"}
+
+# Mismatch messages, the %s placeholders are filled and highlighted by format_mismatch when printing
+_DOCSTRING_NOT_FOUND = "Docstring not found."
+_ARG_NOT_IN_DOCSTRING = "Argument %s not in docstring."
+_ARG_ONLY_TYPED_IN_DOCSTRING = "Argument %s has no type, but docstring has %s."
+_ARG_WITHOUT_TYPE = "Warning argument %s has no type."
+_ARG_TYPE_MISMATCH = "Argument TypeMismatch %s:\n        function: %s\n        docstring: %s"
+_ARG_OPTIONAL_MISSING = "Argument %s has a default value, but %s is missing in the docstring."
+_ARG_OPTIONAL_UNEXPECTED = "Argument %s has NO default value, but the docstring contains %s."
+_ARG_ORDER_MISMATCH = "Function arguments order does not match docstring arguments order:\n        function:  %s\n        docstring: %s"
+_RETURN_TYPE_MISSING = "Function has no return type."
+_RETURN_TYPE_NONE = "Function has a return value, but no return type is specified."
+_RETURN_VALUE_MISSING = "Function has no return value, but the return type is %s."
+_RETURN_TYPE_MISMATCH = "Return TypeMismatch:\n        function:  %s\n        docstring: %s"
+_RETURN_NOT_IN_DOCSTRING = "Return-type %s not in docstring."
+
+
+def get_node_source(node: expr, source_lines: list[bytes]) -> str:
+    """
+    Extracts the source code of a node in the normalized form of ast.unparse, using the lines of the parsed file where they already match it.
+
+    Args:
+        node (expr): The node to extract the source code of.
+        source_lines (list[bytes]): The lines of the parsed file.
+
+    Returns:
+        str: The source code of the node.
+    """
+    if isinstance(node, Name):
+        # Plain names are the most common annotations and their source is the identifier itself
+        return node.id
+    if node.lineno == node.end_lineno:
+        # Column offsets are in bytes, so the line has to be sliced before decoding
+        try:
+            source = source_lines[node.lineno - 1][node.col_offset:node.end_col_offset].decode("utf-8")
+        except UnicodeDecodeError:
+            source = ""
+        if _SIMPLE_SOURCE_RE.fullmatch(source):
+            return source
+    # Everything else is unparsed, so spacing, quotes and line breaks are spelled the same everywhere
+    return unparse(node)
+
+
+def get_function_args_with_defaults(function: FunctionDef, source_lines: list[bytes]) -> dict[str, tuple[Optional[str], Optional[str]]]:
     """
     Extracts argument names, types, and default values from a function definition.
 
     Args:
         function (FunctionDef): The function definition node.
+        source_lines (list[bytes]): The lines of the file the function is defined in.
 
     Returns:
-        dict: A dictionary with argument names as keys and a dictionary of type and default value as values.
+        dict[str, tuple[Optional[str], Optional[str]]]: A dictionary with argument names as keys and a tuple of type and default value as values.
     """
     args = function.args.args
     defaults = function.args.defaults
-    num_defaults = len(defaults)
-    num_args = len(args)
+    # Defaults belong to the last arguments, including positional only ones, so they are aligned from the end
+    padded_defaults: list[Optional[expr]] = [None] * len(args)
+    padded_defaults.extend(defaults)
     args_info = {}
-    for i, arg in enumerate(args):
-        has_default = i >= num_args - num_defaults
-        default_value = None
-        if has_default:
-            default_node = defaults[i - (num_args - num_defaults)]
-            default_value = unparse(default_node)
-        arg_type = unparse(arg.annotation) if arg.annotation else None
-        args_info[arg.arg] = {
-            "type": arg_type,
-            "default": default_value,
-        }
+    for arg, default_node in zip(args, padded_defaults[-len(args):]):
+        default_value = get_node_source(default_node, source_lines) if default_node else None
+        arg_type = get_node_source(arg.annotation, source_lines) if arg.annotation else None
+        args_info[arg.arg] = (arg_type, default_value)
     return args_info
 
 
-def extract_args_from_docstring(docstring: str) -> dict:
+def extract_docstring_args_and_order(doc_lines: list[str]) -> tuple[dict, list[str]]:
     """
-    Extracts argument names and types from a docstring.
+    Extracts argument names, their types and their order from the lines of a docstring.
 
     Args:
-        docstring (str): The docstring to extract from.
+        doc_lines (list[str]): The lines of the docstring to extract from.
 
     Returns:
-        dict: A dictionary with argument names as keys and their types as values.
+        tuple[dict, list[str]]: A dictionary with argument names as keys and their types as values, and a list of argument names in the order they appear in the docstring.
     """
     args = {}
-    if not docstring:
-        return args
-    args_section = search(r"Args:\s*(.*?)(\n\n|\Z)", docstring, DOTALL)
-    if args_section:
-        args_text = args_section.group(1)
-        lines = args_text.split('\n')
-        for line in lines:
-            matches = match(r'\s*(\w+)\s*\(([^)]+)\):', line)
-            if matches:
-                arg_name, arg_type = matches.groups()
+    order = []
+    in_args_section = False
+    has_arg_lines = False
+    in_order = True
+    for line in doc_lines:
+        line = line.strip()
+        if not in_args_section:
+            in_args_section = line.lower().startswith("args:")
+            continue
+        if not line:
+            # Blank lines directly below the header belong to the layout, only later ones end the section
+            if has_arg_lines:
+                break
+            continue
+        has_arg_lines = True
+        if not (line[0].isalpha() or line[0] == "_"):
+            # The order ends with the first line that is no argument, but types may still follow
+            in_order = False
+        matches = _ARG_LINE_RE.match(line)
+        if matches:
+            arg_name, arg_type = matches.groups()
+            if arg_type:
                 args[arg_name] = arg_type
-    return args
+            if in_order and arg_name != "self":
+                order.append(arg_name)
+    return args, order
 
 
-def extract_docstring_arg_order(docstring: str) -> list[str]:
+def collect_functions(node: AST, functions: list) -> bool:
     """
-    Extracts the order of argument names from a docstring.
+    Recursively collects the function definitions below a node, skipping expressions since they cannot contain any.
 
     Args:
-        docstring (str): The docstring to extract from.
+        node (AST): The node to collect the function definitions of.
+        functions (list): The list to append the function definition nodes and whether they return a value to.
 
     Returns:
-        list[str]: A list of argument names in the order they appear in the docstring.
+        bool: True if a statement below the node returns a value, not counting nested functions.
     """
-    if not docstring:
-        return []
-    args = []
-    in_args_section = False
-    for line in docstring.splitlines():
-        line = line.strip()
-        if line.lower().startswith("args:"):
-            in_args_section = True
-            continue
-        if in_args_section:
-            if not line or not (line[0].isalpha() or line[0] == "_"):
-                break
-            matches = match(r"(\w+)(?:\s*\([^)]+\))?:", line)
-            if matches:
-                if matches.group(1) != "self":
-                    args.append(matches.group(1))
-    return args
-
-
-def get_functions_from_file(filepath: str) -> list:
+    has_return = False
+    for child in iter_child_nodes(node):
+        if isinstance(child, FunctionDef):
+            # Reserve the position first, so the functions stay in source order
+            index = len(functions)
+            functions.append(None)
+            functions[index] = (child, collect_functions(child, functions))
+        elif isinstance(child, AsyncFunctionDef):
+            collect_functions(child, functions)
+        elif isinstance(child, Return):
+            if child.value is not None:
+                has_return = True
+        elif not isinstance(child, expr):
+            if collect_functions(child, functions):
+                has_return = True
+    return has_return
+
+
+def get_functions_from_file(filepath: str) -> tuple[list[bytes], list[tuple[FunctionDef, bool]]]:
     """
     Parses a Python file and extracts all function definitions.
 
@@ -101,142 +173,306 @@ def get_functions_from_file(filepath: str) -> list:
         filepath (str): The path to the Python file.
 
     Returns:
-        list: A list of function definition nodes.
+        tuple[list[bytes], list[tuple[FunctionDef, bool]]]: The lines of the file and the function definition nodes together with whether they return a value.
     """
-    with open(filepath, "r", encoding="utf-8") as f:
+    with open(filepath, "rb") as f:
         source = f.read()
-    tree = parse(source)
-    functions = []
-    for node in ast_walk(tree):
-        if isinstance(node, FunctionDef):
-            functions.append(node)
-    return functions
+    return get_functions_from_source(source, filepath)
 
 
-def function_has_return_value(function: FunctionDef) -> bool:
+def get_functions_from_source(source: bytes, filename: str = "<unknown>") -> tuple[list[bytes], list[tuple[FunctionDef, bool]]]:
     """
-    Checks if a function has a return value.
+    Parses Python source code and extracts all function definitions.
 
     Args:
-        function (FunctionDef): The function definition node.
+        source (bytes): The Python source code, in the encoding it declares.
+        filename (str, optional): The file name used in syntax errors.
 
     Returns:
-        bool: True if the function has a return value, False otherwise.
+        tuple[list[bytes], list[tuple[FunctionDef, bool]]]: The lines of the source code and the function definition nodes together with whether they return a value.
     """
-    for node in ast_walk(function):
-        if isinstance(node, Return) and node.value is not None:
-            return True
-    return False
+    # Every function definition contains the keyword, so files without it need no parsing
+    if b"def" not in source:
+        return [], []
+    encoding, _ = detect_encoding(BytesIO(source).readline)
+    if encoding == "utf-8-sig":
+        # The BOM would shift the column offsets of the first line
+        source = source[3:]
+    if encoding in ("utf-8", "utf-8-sig"):
+        # The parser decodes UTF-8 bytes itself, so no intermediate string is needed
+        tree = parse(source, filename)
+    else:
+        # Column offsets refer to the UTF-8 encoding of the source, so other encodings are converted
+        text = source.decode(encoding)
+        tree = parse(text, filename)
+        source = text.encode("utf-8")
+    functions: list = []
+    collect_functions(tree, functions)
+    return source.splitlines(), functions
+    # The parser decodes UTF-8 bytes itself, so no intermediate string is needed
+    functions = []
+    collect_functions(parse(source, filename), functions)
+    return source.splitlines(), functions
 
 
-def extract_return_from_function(function: FunctionDef) -> str:
+def extract_return_from_function(function: FunctionDef, source_lines: list[bytes]) -> Optional[str]:
     """
     Extracts the return type from a function definition.
 
     Args:
         function (FunctionDef): The function definition node.
+        source_lines (list[bytes]): The lines of the file the function is defined in.
 
     Returns:
-        str: The return type as a string.
+        Optional[str]: The return type as a string.
     """
     if function.returns:
-        return unparse(function.returns)
+        return get_node_source(function.returns, source_lines)
     return None
 
 
-def extract_return_from_docstring(docstring: str) -> str:
+def extract_return_from_docstring(doc_lines: list[str]) -> Optional[str]:
     """
-    Extracts the return type from a docstring.
+    Extracts the return type from the lines of a docstring.
 
     Args:
-        docstring (int): The docstring to extract from.
+        doc_lines (list[str]): The lines of the docstring to extract from.
 
     Returns:
-        str: The return type as a string.
+        Optional[str]: The return type as a string.
     """
-    if not docstring:
-        return None
-    matches = search(r"Returns:\s*\n\s*([^:]+)", docstring)
-    if matches:
-        return matches.group(1)
+    # The Returns section is usually at the end, so it is searched from the back
+    for index in range(len(doc_lines) - 1, -1, -1):
+        line = doc_lines[index].strip()
+        if line.startswith("Returns:"):
+            if line != "Returns:":
+                return None
+            for return_line in doc_lines[index + 1:]:
+                return_line = return_line.strip()
+                if return_line:
+                    return return_line.split(":", 1)[0].strip()
+            return None
     return None
 
 
-def check_function(function: FunctionDef, verbose: bool) -> list[str]:
+@lru_cache(maxsize=4096)
+def parse_docstring(docstring: str) -> tuple[dict, list[str], Optional[str]]:
+    """
+    Extracts the argument types, the argument order and the return type from a docstring, caching repeated docstrings.
+
+    Args:
+        docstring (str): The docstring to extract from.
+
+    Returns:
+        tuple[dict, list[str], Optional[str]]: The argument types by name, the argument names in order and the return type.
+    """
+    # The results are shared between all functions with the same docstring, so they must not be modified
+    doc_lines = docstring.splitlines()
+    doc_args, doc_arg_order = extract_docstring_args_and_order(doc_lines)
+    return doc_args, doc_arg_order, extract_return_from_docstring(doc_lines)
+
+
+def format_mismatch(template: str, *values: str) -> Text:
+    """
+    Fills a mismatch message template with highlighted values, without going through Rich markup.
+
+    Args:
+        template (str): The message with a %s placeholder for every value.
+        *values (str): The values to insert, in order.
+
+    Returns:
+        Text: The styled message.
+    """
+    # Values such as list[str] are kept literally instead of being parsed as markup tags
+    parts = template.split("%s")
+    text = Text(parts[0], style="base_error_color")
+    for value, part in zip(values, parts[1:]):
+        text.append(value, style="highlight_error_color")
+        text.append(part)
+    return text
+
+
+def check_function(function: FunctionDef, has_return: bool, source_lines: list[bytes], verbose: bool) -> list[tuple[str, tuple[str, ...]]]:
     """
     Checks a function for mismatches between its arguments and the docstring.
 
     Args:
         function (FunctionDef): The function definition node.
-        verbose (int): Whether to print verbose output.
+        has_return (bool): Whether the function returns a value.
+        source_lines (list[bytes]): The lines of the file the function is defined in.
+        verbose (bool): Whether to include warnings.
 
     Returns:
-        list[int]: A list of mismatches found in the function's docstring.
+        list[tuple[str, tuple[str, ...]]]: The message template and its values of every mismatch found in the function's docstring.
     """
-    mismatches = []
-    # Argument type check
-    args_info = get_function_args_with_defaults(function)
     docstring = get_docstring(function)
-    doc_args = extract_args_from_docstring(docstring)
-    for name, info in args_info.items():
-        type_hint = info["type"]
-        default = info["default"]
+    if docstring is None:
+        # Nothing to compare against, so one report replaces the per argument and return checks
+        return [(_DOCSTRING_NOT_FOUND, ())]
+    mismatches: list[tuple[str, tuple[str, ...]]] = []
+    # Argument type check
+    args_info = get_function_args_with_defaults(function, source_lines)
+    doc_args, doc_arg_order, doc_return = parse_docstring(docstring)
+    for name, (type_hint, default) in args_info.items():
         doc_type = doc_args.get(name)
         if name != "self":
             if type_hint and doc_type is None:
-                    mismatches.append(f"[base_error_color]Argument [highlight_error_color]{name}[/highlight_error_color] not in docstring.[/base_error_color]")
+                    mismatches.append((_ARG_NOT_IN_DOCSTRING, (name,)))
             else:
                 expected_doc_type = f"{type_hint}, optional" if default is not None else type_hint
                 if not type_hint:
                     if doc_type:
-                        mismatches.append(f"[base_error_color]Argument [highlight_error_color]{name}[/highlight_error_color] has no type, but docstring has [highlight_error_color]{doc_type}[/highlight_error_color].[/base_error_color]")
+                        mismatches.append((_ARG_ONLY_TYPED_IN_DOCSTRING, (name, doc_type)))
                     else:
                         if verbose:
-                            mismatches.append(f"[base_error_color]Warning argument [highlight_error_color]{name}[/highlight_error_color] has no type.[/base_error_color]")
+                            mismatches.append((_ARG_WITHOUT_TYPE, (name,)))
                 if doc_type:
                     if type_hint and not (doc_type == type_hint or doc_type == expected_doc_type):
-                        mismatches.append(f"[base_error_color]Argument TypeMismatch [highlight_error_color]{name}[/highlight_error_color]:\n{' ' * 8}function: [highlight_error_color]{type_hint}[/highlight_error_color]\n{' ' * 8}docstring: [highlight_error_color]{doc_type}[/highlight_error_color][/base_error_color]")
+                        mismatches.append((_ARG_TYPE_MISMATCH, (name, type_hint, doc_type)))
                     elif default is not None and "optional" not in doc_type:
-                        mismatches.append(f"[base_error_color]Argument [highlight_error_color]{name}[/highlight_error_color] has a default value, but [highlight_error_color]optional[/highlight_error_color] is missing in the docstring.[/base_error_color]")
+                        mismatches.append((_ARG_OPTIONAL_MISSING, (name, "optional")))
                     elif default is None and doc_type and "optional" in doc_type:
-                        mismatches.append(f"[base_error_color]Argument [highlight_error_color]{name}[/highlight_error_color] has NO default value, but the docstring contains [highlight_error_color]optional[/highlight_error_color].[/base_error_color]")
+                        mismatches.append((_ARG_OPTIONAL_UNEXPECTED, (name, "optional")))
                 else:
-                    mismatches.append(f"[base_error_color]Docstring not found.[/base_error_color]")
+                    mismatches.append((_DOCSTRING_NOT_FOUND, ()))
     # Return type check
-    has_return = function_has_return_value(function)
-    func_return = extract_return_from_function(function)
-    doc_return = extract_return_from_docstring(docstring)
+    func_return = extract_return_from_function(function, source_lines)
     if not func_return:
-        mismatches.append(f"[base_error_color]Function has no return type.[/base_error_color]")
+        mismatches.append((_RETURN_TYPE_MISSING, ()))
     elif has_return and func_return == "None":
-        mismatches.append(f"[base_error_color]Function has a return value, but no return type is specified.[/base_error_color]")
+        mismatches.append((_RETURN_TYPE_NONE, ()))
     elif not has_return and func_return != "None":
-        mismatches.append(f"[base_error_color]Function has no return value, but the return type is [highlight_error_color]{func_return}[/highlight_error_color].[/base_error_color]")
+        mismatches.append((_RETURN_VALUE_MISSING, (func_return,)))
     elif func_return and doc_return and func_return != doc_return:
-        # 
-        print(str(func_return), doc_return)
-        mismatches.append(f"[base_error_color]Return TypeMismatch:\n{' ' * 8}function:  [highlight_error_color]{func_return}[/highlight_error_color]\n{' ' * 8}docstring: [highlight_error_color]{doc_return}[/highlight_error_color][/base_error_color]")
+        mismatches.append((_RETURN_TYPE_MISMATCH, (func_return, doc_return)))
     elif func_return and not doc_return and func_return != "None":
-        mismatches.append(f"[base_error_color]Return-type [highlight_error_color]{func_return}[/highlight_error_color] not in docstring.[/base_error_color]")
-    elif [arg.arg for arg in function.args.args if arg.arg != "self"] != extract_docstring_arg_order(docstring) and verbose:
-        mismatches.append(f"[base_error_color]Function arguments order does not match docstring arguments order:\n{' ' * 8}function:  [highlight_error_color]{[arg.arg for arg in function.args.args if arg.arg != 'self']}[/highlight_error_color]\n{' ' * 8}docstring: [highlight_error_color]{extract_docstring_arg_order(docstring)}[/highlight_error_color][/base_error_color]")
+        mismatches.append((_RETURN_NOT_IN_DOCSTRING, (func_return,)))
+    elif verbose:
+        func_arg_order = [arg.arg for arg in function.args.args if arg.arg != "self"]
+        if func_arg_order != doc_arg_order:
+            mismatches.append((_ARG_ORDER_MISMATCH, (str(func_arg_order), str(doc_arg_order))))
     return mismatches
 
 
+def find_python_files(directory: str, ignored_files: set[str]) -> list[str]:
+    """
+    Recursively collects the Python files in a directory, skipping virtual environment, test and tool directories.
+
+    Args:
+        directory (str): The directory to search.
+        ignored_files (set[str]): File names to skip.
+
+    Returns:
+        list[str]: The paths of the Python files, in the same order as os.walk.
+    """
+    file_paths = []
+    stack = [directory]
+    while stack:
+        root = stack.pop()
+        subdirectories = []
+        try:
+            with scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink() and entry.name not in _IGNORED_DIRECTORIES:
+                            subdirectories.append(entry.path)
+                    elif entry.name.endswith(".py") and entry.name not in ignored_files:
+                        file_paths.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirectories))
+    return file_paths
+
+
+def remove_nested_directories(directories: list[str]) -> list[str]:
+    """
+    Removes duplicate directories and directories whose files are already collected from another given directory, keeping the given order.
+
+    Args:
+        directories (list[str]): The absolute paths of the directories.
+
+    Returns:
+        list[str]: The directories that are not covered by another one.
+    """
+    # Paths are compared in canonical form, so differently cased or linked spellings of a directory are found too
+    canonical_directories: dict[str, str] = {}
+    for directory in directories:
+        canonical_directories.setdefault(normcase(realpath(directory)), directory)
+    kept_directories = []
+    for canonical, directory in canonical_directories.items():
+        for other in canonical_directories:
+            prefix = other.rstrip(sep) + sep
+            # The walk of the outer directory skips ignored directories, so paths below one are still checked on their own
+            if other != canonical and canonical.startswith(prefix) and not any(part in _IGNORED_DIRECTORIES for part in canonical[len(prefix):].split(sep)):
+                break
+        else:
+            kept_directories.append(directory)
+    return kept_directories
+
+
+def check_file(file_path: str, verbose: bool, cache_dir: Optional[str] = None) -> list[tuple[str, int, list[tuple[str, tuple[str, ...]]]]]:
+    """
+    Checks all functions of a Python file, reusing cached results if the file is unchanged.
+
+    Args:
+        file_path (str): The path to the Python file.
+        verbose (bool): Whether to include warnings.
+        cache_dir (Optional[str], optional): Directory to store the results in, keyed by the file content.
+
+    Returns:
+        list[tuple[str, int, list[tuple[str, tuple[str, ...]]]]]: Name, line number and mismatches of every function in the file.
+    """
+    with open(file_path, "rb") as f:
+        source = f.read()
+    cache_path = None
+    if cache_dir:
+        cache_name = f"{blake2b(source).hexdigest()}{'-verbose' if verbose else ''}.pkl"
+        cache_path = join(cache_dir, CACHE_KEY, cache_name)
+        try:
+            with open(cache_path, "rb") as f:
+                return load(f)
+        except (OSError, EOFError, UnpicklingError):
+            pass
+    results = []
+    source_lines, functions = get_functions_from_source(source, file_path)
+    for function, has_return in functions:
+        results.append((function.name, function.lineno, check_function(function, has_return, source_lines, verbose)))
+    if cache_path:
+        # The results are moved into place at once, so other processes never read a partly written file
+        temp_path = f"{cache_path}.{getpid()}.tmp"
+        try:
+            makedirs(dirname(cache_path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                dump(results, f)
+            replace(temp_path, cache_path)
+        except OSError:
+            # An unwritable cache only means the file is checked again next time
+            with suppress(OSError):
+                remove(temp_path)
+    return results
+
+
 def main() -> None:
+    """
+    Checks the docstrings of all Python files in the given paths and prints the mismatches.
+    """
     parser = ArgumentParser(description = "Compares names and types in docstrings with function params.")
-    parser.add_argument("paths", nargs="+", type=Path, help="Paths to directories or files to check docstrings.")
+    parser.add_argument("paths", nargs="+", help="Paths to directories or files to check docstrings.")
     parser.add_argument("-f", "--files", nargs="+", help="List of files to ignore, like: file1.py file2.py")
     parser.add_argument("-n", "--names", nargs="+", help="List of function names to ignore, like: func1 func2")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose output.")
+    parser.add_argument("-c", "--cache-dir", help="Directory to cache results of unchanged files in.")
+    parser.add_argument("-j", "--jobs", type=int, help="Number of processes to check files with, defaults to the number of CPUs.")
     args = parser.parse_args()
-    if args.files is None:
-        args.files = []
-    if args.names is None:
-        args.names = []
-    total_files = 0
-    total_functions = 0
-    total_mismatches = 0
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("argument -j/--jobs: must be at least 1")
+    # Sets keep the ignore checks constant time for every file and function
+    args.files = set(args.files or ())
+    args.names = set(args.names or ())
+    # Files below overlapping paths would otherwise be checked and counted more than once
+    directories = remove_nested_directories([abspath(path) for path in args.paths])
+    checked_files: set[str] = set()
+    stats = []
     theme = Theme({
         "base_color": "bold cyan",
         "highlight_color": "bold purple",
@@ -245,35 +481,42 @@ def main() -> None:
         "highlight_error_color": "red",
     })
     console = Console(theme=theme)
-    for directory in args.paths:
-        directory = Path(directory).resolve()
-        if isdir(directory):
-            for root, _, files in walk(directory):
-                if "venv" in root or "test" in root:
-                    continue
-                for file in files:
-                    if file.endswith(".py") and not file in args.files:
-                        mismatches_boxes = []
-                        total_files += 1
-                        file_path = join(root, file)
-                        functions = get_functions_from_file(file_path)
-                        for function in functions:
-                            if not function.name in args.names:
-                                total_functions += 1
-                                mismatches = check_function(function, args.verbose)
-                                if mismatches:
-                                    mismatch_title = f"[base_color]Function [highlight_color]{function.name}[/highlight_color] [Line[second_highlight_color] {function.lineno}[/second_highlight_color]]:[/base_color]"
-                                    mismatches_text = "\n\n".join(f"    [base_color]-[/base_color] {mismatch}" for mismatch in mismatches)
-                                    total_mismatches += len(mismatches)
-                                    mismatches_boxes.append(Panel(mismatches_text, title=mismatch_title, border_style="yellow", title_align="left"))
-                        if mismatches_boxes:
-                            # FIXME: Some padding is needed. Maybe some more styling
-                            console.print(Panel(Group(*mismatches_boxes), title=f"[base_color]Checking file:[/base_color] [highlight_color]{file_path}[/highlight_color]"))
-        else:
-            console.print(f"[bold red]Invalid directory:[/bold red] [highlight_color]{directory}[/highlight_color]")
-        console.print(f"[base_color]Stats for [highlight_color]{directory}[/highlight_color]:[/base_color]")
-        console.print(f"    [base_color]Checked [second_highlight_color]{total_files}[/second_highlight_color] files with [second_highlight_color]{total_functions}[/second_highlight_color] functions.[/base_color]")
-        console.print(f"    [base_color]Found [bold red]{total_mismatches}[/bold red] mismatches in docstrings.[/base_color]")
+    check = partial(check_file, verbose=args.verbose, cache_dir=args.cache_dir)
+    with ProcessPoolExecutor(args.jobs) as executor:
+        for directory in directories:
+            if isdir(directory):
+                file_paths = []
+                for file_path in find_python_files(directory, args.files):
+                    # Kept directories can still overlap, for example through a directory below an ignored one
+                    canonical_file_path = normcase(realpath(file_path))
+                    if canonical_file_path not in checked_files:
+                        checked_files.add(canonical_file_path)
+                        file_paths.append(file_path)
+                total_functions = 0
+                total_mismatches = 0
+                # Files are checked in parallel, but reported in walk order
+                for file_path, results in zip(file_paths, executor.map(check, file_paths, chunksize=16)):
+                    mismatches_boxes = []
+                    for name, lineno, mismatches in results:
+                        if name not in args.names:
+                            total_functions += 1
+                            if mismatches:
+                                mismatch_title = Text.assemble("Function ", (name, "highlight_color"), " [Line", (f" {lineno}", "second_highlight_color"), "]:", style="base_color")
+                                mismatches_text = Text("\n\n").join(Text.assemble("    ", ("-", "base_color"), " ", format_mismatch(template, *values)) for template, values in mismatches)
+                                total_mismatches += len(mismatches)
+                                mismatches_boxes.append(Panel(mismatches_text, title=mismatch_title, border_style="yellow", title_align="left"))
+                    if mismatches_boxes:
+                        # FIXME: Some padding is needed. Maybe some more styling
+                        console.print(Panel(Group(*mismatches_boxes), title=Text.assemble(("Checking file:", "base_color"), " ", (file_path, "highlight_color"))))
+                stats.append(
+                    f"[base_color]Stats for [highlight_color]{directory}[/highlight_color]:[/base_color]\n"
+                    f"    [base_color]Checked [second_highlight_color]{len(file_paths)}[/second_highlight_color] files with [second_highlight_color]{total_functions}[/second_highlight_color] functions.[/base_color]\n"
+                    f"    [base_color]Found [bold red]{total_mismatches}[/bold red] mismatches in docstrings.[/base_color]"
+                )
+            else:
+                console.print(f"[bold red]Invalid directory:[/bold red] [highlight_color]{directory}[/highlight_color]")
+    if stats:
+        console.print("\n".join(stats))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 from argparse import ArgumentParser, Namespace
+from concurrent.futures import Executor, ProcessPoolExecutor
 from os import walk
 from os.path import isdir, join, exists, relpath
 from pathlib import Path
@@ -16,48 +17,54 @@ def count_lines_in_file(file_path: str) -> tuple[int, int]:
         tuple[int, int]: Number of code lines and total lines in the file.
     """
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
-            code_lines = sum(1 for line in file if line.strip() != "")
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as file:
-            total_lines = sum(1 for _ in file)
+        code_lines = 0
+        total_lines = 0
+        # Blank lines can be detected on the raw bytes, so the file is neither decoded nor read twice
+        with open(file_path, "rb") as file:
+            for line in file:
+                total_lines += 1
+                if line.strip():
+                    code_lines += 1
         return code_lines, total_lines
     except Exception as e:
         print(f"Error while reading {file_path}: {e}")
         return 0, 0
 
 
-def count_lines_in_directory(args: Namespace, directory_path: str) -> tuple[int, int, dict[str, list[int]]]:
+def count_lines_in_directory(args: Namespace, directory_path: str, executor: Executor) -> tuple[int, int, list[str], list[int], list[int]]:
     """
     Count lines of code in a directory and its subdirectories.
 
     Args:
         args (Namespace): Command line arguments.
         directory_path (str): Path to the directory.
+        executor (Executor): Executor to count the lines of the files with.
 
     Returns:
-        tuple[int, int, dict[str, list[int]]]: Total code lines, total lines, and a dictionary with file paths as keys and a list of code lines and total lines as values.
+        tuple[int, int, list[str], list[int], list[int]]: Total code lines, total lines, and the file paths with the code lines and total lines of each file at the same index.
     """
-    total_lines = 0
-    total_code_lines = 0
-    file_counts = {}
+    file_paths = []
     gitignore_spec = load_gitignore_spec(directory_path) if args.gitignore else None
+    # A negation pattern may add back files below an ignored directory, so directories are only pruned without one
+    prune_spec = gitignore_spec if gitignore_spec and all(pattern.include is not False for pattern in gitignore_spec.patterns) else None
     for root, dirs, files in walk(directory_path):
-        dirs[:] = [d for d in dirs if d not in args.directories]
-        files[:] = [f for f in files if f not in args.files]
-        if gitignore_spec and gitignore_spec.match_file(relpath(root, directory_path)):
+        rel_root = relpath(root, directory_path)
+        # Ignored directories are pruned here, so walk never descends into them
+        dirs[:] = [d for d in dirs if d not in args.directories and not (prune_spec and prune_spec.match_file(join(rel_root, d) + "/"))]
+        if gitignore_spec and not prune_spec and gitignore_spec.match_file(rel_root):
             continue
         for file in files:
-            file_path = join(root, file)
-            rel_file_path = relpath(file_path, directory_path)
-            if gitignore_spec and gitignore_spec.match_file(rel_file_path):
+            if file in args.files or (gitignore_spec and gitignore_spec.match_file(join(rel_root, file))):
                 continue
-            if args.ext == [] or file.split(".")[-1] in args.ext:
-                file_path = join(root, file)
-                code_line_count, line_count = count_lines_in_file(file_path)
-                file_counts[file_path] = [code_line_count, line_count]
-                total_lines += line_count
-                total_code_lines += code_line_count
-    return total_code_lines, total_lines, file_counts
+            if not args.ext or file.endswith(args.ext):
+                file_paths.append(join(root, file))
+    # The counts are kept in lists parallel to the paths instead of a list per file
+    code_line_counts = []
+    line_counts = []
+    for code_line_count, line_count in executor.map(count_lines_in_file, file_paths, chunksize=32):
+        code_line_counts.append(code_line_count)
+        line_counts.append(line_count)
+    return sum(code_line_counts), sum(line_counts), file_paths, code_line_counts, line_counts
 
 
 def load_gitignore_spec(directory_path: str) -> PathSpec:
@@ -80,6 +87,9 @@ def load_gitignore_spec(directory_path: str) -> PathSpec:
 
 
 def main() -> None:
+    """
+    Counts the lines of all files in the given paths and prints the statistics.
+    """
     parser = ArgumentParser(description = "Count lines of code in Python files.")
     parser.add_argument("paths", nargs = "+", type = Path, help = "Paths to directories or files to count lines of code.")
     parser.add_argument("-e", "--ext", nargs = "+", help = "List of file extensions, like: py pyw")
@@ -87,31 +97,35 @@ def main() -> None:
     parser.add_argument("-d", "--directories", nargs = "+", help = "List of directories to ignore, like: dir1 dir2")
     parser.add_argument("-g", "--gitignore", action = "store_true", help = "Ignore files in .gitignore")
     parser.add_argument("-v", "--verbose", action = "store_true", help = "Verbose output")
+    parser.add_argument("-j", "--jobs", type = int, help = "Number of processes to count files with, defaults to the number of CPUs")
     args = parser.parse_args()
-    if args.ext is None:
-        args.ext = []
-    if args.files is None:
-        args.files = []
-    if args.directories is None:
-        args.directories = []
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("argument -j/--jobs: must be at least 1")
+    # The extensions are matched as suffixes, which str.endswith accepts as a tuple
+    args.ext = tuple(f".{ext}" for ext in args.ext or ())
+    args.files = set(args.files or ())
+    args.directories = set(args.directories or ())
     total_code_lines = 0
     total_lines = 0
-    for directory in args.paths:
-        directory = Path(directory).resolve()
-        if isdir(directory):
-            directory_code_lines, directory_lines, file_counts = count_lines_in_directory(args, directory)
-            total_code_lines += directory_code_lines
-            total_lines += directory_lines
-            if args.verbose:
-                print(f"Directory: {directory}")
-                for file, lines in file_counts.items():
-                    if lines[1] == 0:
-                        print(f"{file}: {lines[0]}/{lines[1]}")
-                    else:
-                        print(f"{file}: {lines[0]}/{lines[1]} lines => {lines[0] / lines[1] * 100:.2f}%")
-                print(f"Total code lines in {directory}: {directory_code_lines}/{directory_lines}\n")
-        else:
-            print(f"Invalid directory: {directory}")
+    with ProcessPoolExecutor(args.jobs) as executor:
+        for directory in args.paths:
+            directory = Path(directory).resolve()
+            if isdir(directory):
+                directory_code_lines, directory_lines, file_paths, code_line_counts, line_counts = count_lines_in_directory(args, directory, executor)
+                total_code_lines += directory_code_lines
+                total_lines += directory_lines
+                if args.verbose:
+                    # Collect the report and write it at once instead of printing every file separately
+                    output = [f"Directory: {directory}"]
+                    for file, code_line_count, line_count in zip(file_paths, code_line_counts, line_counts):
+                        if line_count == 0:
+                            output.append(f"{file}: {code_line_count}/{line_count}")
+                        else:
+                            output.append(f"{file}: {code_line_count}/{line_count} lines => {code_line_count / line_count * 100:.2f}%")
+                    output.append(f"Total code lines in {directory}: {directory_code_lines}/{directory_lines}\n")
+                    print("\n".join(output))
+            else:
+                print(f"Invalid directory: {directory}")
     print(f"Code percentage: {total_code_lines / total_lines * 100:.2f}%")
     print(f"Code to space ratio: {total_code_lines / (total_lines - total_code_lines):.2f}/1")
     print(f"Total empty lines: {total_lines - total_code_lines}")